@@ -1,13 +1,65 @@
 import sys
 import os
+import importlib.util
+import io
+import multiprocessing
+import queue
+import shutil
+import struct
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from functools import partial
 from pathlib import Path
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QLineEdit, QFileDialog, QProgressBar, QTextEdit, QCheckBox, QLabel
+    QLineEdit, QFileDialog, QProgressBar, QTextEdit, QCheckBox, QLabel, QGridLayout
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QThread, QElapsedTimer, QTimer, pyqtSignal
 from PyQt5.QtGui import QIcon, QPixmap
-from PIL import Image
+from PIL import Image, UnidentifiedImageError, features
+
+# libvips is optional: when present it replaces the Pillow resize path
+try:
+    import pyvips
+    # Cached operations keep source files open, which blocks overwriting them on Windows
+    pyvips.cache_set_max(0)
+except (ImportError, OSError):
+    pyvips = None
+
+# Optional slow recompression pass, kept out of the default libjpeg-turbo fast path
+try:
+    import mozjpeg_lossless_optimization
+except ImportError:
+    mozjpeg_lossless_optimization = None
+
+# Optional PNG optimizer: when present, PNGs are written at the fastest zlib level and
+# then recompressed by oxipng at its lowest preset. That takes a fraction of the CPU of
+# Pillow's optimize=True for files within a few percent of its size. Higher presets are
+# smaller but slower than optimize=True
+try:
+    import oxipng
+except ImportError:
+    oxipng = None
+
+# Flush buffered log lines after this many images or milliseconds, whichever comes first
+LOG_FLUSH_COUNT = 32
+LOG_FLUSH_MS = 250
+
+# The GUI polls the worker's progress counter at ~30 Hz instead of receiving a signal per image
+PROGRESS_POLL_MS = 33
+
+# JPEGs decoded, resized and encoded together per GPU round trip
+GPU_BATCH_SIZE = 32
+GPU_PREFETCH_BATCHES = 2
+
+# Pillow format names expected behind each supported extension
+IMAGE_FORMATS = {".jpg": "JPEG", ".jpeg": "JPEG", ".png": "PNG"}
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Start-of-frame markers carrying the image dimensions (C4, C8 and CC are not frames)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# Markers without a length field
+JPEG_STANDALONE_MARKERS = {0x01, 0xD0, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8}
 
 def resource_path(relative_path):
     """ Get the absolute path to a resource, works for dev and for PyInstaller """
@@ -18,19 +70,329 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
+def peek_size(img_path):
+    """ Read (width, height) straight from the PNG IHDR chunk or JPEG SOF marker, without setting up
+        a decoder. Returns None if the content does not match the extension or the header is unusual """
+    with open(img_path, "rb") as f:
+        if IMAGE_FORMATS[img_path.suffix.lower()] == "PNG":
+            head = f.read(24)
+            if len(head) < 24 or head[:8] != PNG_SIGNATURE or head[12:16] != b"IHDR":
+                return None
+            return struct.unpack(">II", head[16:24])
+
+        frame = _read_jpeg_frame(f)
+        if frame is None:
+            return None
+        height, width = struct.unpack(">HH", frame[3:7])
+        return (width, height) if height else None
+
+def _read_jpeg_frame(f):
+    """ Return the first 8 bytes of the JPEG frame header: segment length (2), sample precision (1),
+        height (2), width (2) and component count (1). None if it cannot be found """
+    if f.read(2) != b"\xff\xd8":
+        return None
+    # Walk the marker segments, seeking over their payloads, until the frame header
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        while code == 0xFF:  # Fill bytes
+            fill = f.read(1)
+            if not fill:
+                return None
+            code = fill[0]
+
+        if code in JPEG_SOF_MARKERS:
+            frame = f.read(8)
+            return frame if len(frame) == 8 else None
+        if code in JPEG_STANDALONE_MARKERS:
+            continue
+        if code in (0xD9, 0xDA):  # End of image or scan data before any frame
+            return None
+
+        length = f.read(2)
+        if len(length) < 2:
+            return None
+        f.seek(struct.unpack(">H", length)[0] - 2, os.SEEK_CUR)
+
+# libvips would produce different output than Pillow for some inputs: it converts CMYK JPEGs to RGB,
+# expands palettes and tRNS transparency to RGBA and narrows 16-bit PNGs. Those files stay on Pillow
+
+def _vips_matches_jpeg(img_path):
+    """ True for grayscale and YCbCr JPEGs """
+    with open(img_path, "rb") as f:
+        frame = _read_jpeg_frame(f)
+    return frame is not None and frame[7] in (1, 3)
+
+def _vips_matches_png(img_path):
+    """ True for 8-bit gray, RGB and alpha PNGs without palette or tRNS transparency """
+    with open(img_path, "rb") as f:
+        head = f.read(33)  # Signature, then the whole IHDR chunk
+        if len(head) < 33 or head[:8] != PNG_SIGNATURE or head[12:16] != b"IHDR":
+            return False
+        bit_depth, color_type = head[24], head[25]
+        if bit_depth != 8 or color_type not in (0, 2, 4, 6):
+            return False
+        # tRNS has to come before the image data, so only the leading chunks need checking
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return False
+            length, chunk_type = struct.unpack(">I4s", chunk)
+            if chunk_type == b"tRNS":
+                return False
+            if chunk_type == b"IDAT":
+                return True
+            f.seek(length + 4, os.SEEK_CUR)  # Payload and CRC
+
+def _encode_jpeg_vips(img, strip_metadata, jpeg_quality, jpeg_optimize, jpeg_progressive):
+    if img.hasalpha():
+        img = img.flatten(background=[255, 255, 255])
+    return img.write_to_buffer(".jpg", Q=jpeg_quality, optimize_coding=jpeg_optimize,
+                               interlace=jpeg_progressive, strip=strip_metadata)
+
+def _encode_png_vips(img, strip_metadata):
+    if oxipng is not None:
+        return oxipng.optimize_from_memory(img.write_to_buffer(".png", compression=1, strip=strip_metadata),
+                                           level=0)
+    return img.write_to_buffer(".png", compression=9, strip=strip_metadata)
+
+def _save_jpeg_pil(new_img, save_path, metadata, jpeg_quality, jpeg_optimize, jpeg_progressive):
+    # Convert to RGB if necessary (for formats like RGBA or P)
+    if new_img.mode == "RGBA":
+        # Flatten onto white in one pass, without splitting out the alpha band
+        background = Image.new("RGBA", new_img.size, (255, 255, 255, 255))
+        new_img = Image.alpha_composite(background, new_img).convert("RGB")
+    elif new_img.mode == "P":
+        new_img = new_img.convert("RGB")
+
+    # Save with user-defined quality
+    new_img.save(save_path, "JPEG", quality=jpeg_quality, optimize=jpeg_optimize,
+                 progressive=jpeg_progressive, **metadata)
+
+def _save_png_pil(new_img, save_path, metadata):
+    if oxipng is not None:
+        buffer = io.BytesIO()
+        new_img.save(buffer, "PNG", compress_level=1, **metadata)
+        save_path.write_bytes(oxipng.optimize_from_memory(buffer.getvalue(), level=0))
+    else:
+        new_img.save(save_path, "PNG", optimize=True, **metadata)
+
+# Open with only the known plugin, skipping Image.open's probe of every registered format.
+# Content that does not match the extension still goes through the full probe
+
+def _open_jpeg(img_path):
+    try:
+        return Image.open(img_path, formats=["JPEG"])
+    except UnidentifiedImageError:
+        return Image.open(img_path)
+
+def _open_png(img_path):
+    try:
+        return Image.open(img_path, formats=["PNG"])
+    except UnidentifiedImageError:
+        return Image.open(img_path)
+
+def _resize_with_vips(img_path, save_path, target_size, encode):
+    """ Fused decode/resize/encode through libvips, which streams the image in small tiles """
+    # thumbnail() shrinks JPEGs on load and, with size="down", never upscales.
+    # no_rotate keeps the EXIF orientation untouched, as the Pillow path does
+    img = pyvips.Image.thumbnail(str(img_path), target_size, height=target_size, size="down",
+                                 no_rotate=True)
+
+    # Encode to memory first: when overwriting, the source is still being read until here
+    save_path.write_bytes(encode(img))
+
+def _resize_with_pil(img_path, save_path, target_size, strip_metadata, open_image, save):
+    """ Decode, resize and encode with Pillow; used when libvips is not installed """
+    with open_image(img_path) as img:
+        # Savers fall back to img.info for some fields (JPEG comment, PNG ICC profile),
+        # so stripping has to override every field explicitly
+        if strip_metadata:
+            metadata = {"exif": b"", "icc_profile": None, "comment": b""}
+        else:
+            metadata = {"exif": img.info.get("exif", b""), "icc_profile": img.info.get("icc_profile")}
+
+        # Let libjpeg downscale by 1/2, 1/4 or 1/8 in the DCT domain while decoding.
+        # draft() never goes below the requested size, so LANCZOS still sets the final size
+        if img.format == "JPEG":
+            ratio = target_size / max(img.size)
+            if ratio < 1:
+                img.draft(None, (max(1, int(img.width * ratio)), max(1, int(img.height * ratio))))
+
+        width, height = img.size
+        current_max = max(width, height)
+
+        if current_max <= target_size:
+            new_img = img.copy()
+        else:
+            ratio = target_size / current_max
+            new_size = (max(1, int(width * ratio)), max(1, int(height * ratio)))
+            # Large downscales first box-reduce to within 3x of the target, so LANCZOS
+            # convolves a much smaller intermediate
+            new_img = img.resize(new_size, Image.LANCZOS, reducing_gap=3.0)
+
+        save(new_img, save_path, metadata)
+
+def _mozjpeg_recompress(save_path, strip_metadata):
+    """ Losslessly recompress a written JPEG with mozjpeg; smaller file, much slower encode """
+    markers = mozjpeg_lossless_optimization.COPY_MARKERS
+    copy = markers.NONE if strip_metadata else markers.ALL
+    save_path.write_bytes(mozjpeg_lossless_optimization.optimize(save_path.read_bytes(), copy=copy))
+
+def _process_image(img_path, output_dir, target_size, overwrite, strip_metadata,
+                   vips_matches, vips_encode, pil_open, pil_save, post_process=None):
+    """ Resize a single image with format-specific encoders already bound by _process_jpeg/_process_png """
+    try:
+        # Define save path
+        save_path = img_path if overwrite else output_dir / img_path.name
+
+        # Nothing to resize or strip: copy the file byte-for-byte instead of re-encoding it
+        if not strip_metadata:
+            size = peek_size(img_path)
+            if size is None:
+                # Unusual header, or content that does not match the extension
+                with Image.open(img_path) as img:  # Only parses the header
+                    if img.format == IMAGE_FORMATS[img_path.suffix.lower()]:
+                        size = img.size
+            if size is not None and max(size) <= target_size:
+                # In overwrite mode the original already is the result
+                if overwrite:
+                    return img_path.name, True, f"Unchanged: {img_path.name}"
+                shutil.copyfile(img_path, save_path)
+                return img_path.name, True, f"Copied: {img_path.name}"
+
+        # libvips drops JPEG comments and adds an EXIF block of its own, so when metadata
+        # is kept, or the input is one it would convert, Pillow handles the file
+        if pyvips is not None and strip_metadata and vips_matches(img_path):
+            _resize_with_vips(img_path, save_path, target_size, vips_encode)
+        else:
+            _resize_with_pil(img_path, save_path, target_size, strip_metadata, pil_open, pil_save)
+
+        if post_process is not None:
+            post_process(save_path)
+
+        return img_path.name, True, f"Processed: {img_path.name}"
+    except Exception as e:
+        return img_path.name, False, f"Error with {img_path.name}: {str(e)}"
+
+# Pool entry points, one per output format, so the per-image code carries no format checks.
+# They must stay module-level and picklable
+
+def _process_jpeg(img_path, output_dir, target_size, overwrite, strip_metadata,
+                  jpeg_quality, jpeg_optimize, jpeg_progressive, jpeg_mozjpeg):
+    return _process_image(
+        img_path, output_dir, target_size, overwrite, strip_metadata,
+        _vips_matches_jpeg,
+        partial(_encode_jpeg_vips, strip_metadata=strip_metadata, jpeg_quality=jpeg_quality,
+                jpeg_optimize=jpeg_optimize, jpeg_progressive=jpeg_progressive),
+        _open_jpeg,
+        partial(_save_jpeg_pil, jpeg_quality=jpeg_quality, jpeg_optimize=jpeg_optimize,
+                jpeg_progressive=jpeg_progressive),
+        partial(_mozjpeg_recompress, strip_metadata=strip_metadata) if jpeg_mozjpeg else None)
+
+def _process_png(img_path, output_dir, target_size, overwrite, strip_metadata):
+    return _process_image(
+        img_path, output_dir, target_size, overwrite, strip_metadata,
+        _vips_matches_png,
+        partial(_encode_png_vips, strip_metadata=strip_metadata),
+        _open_png,
+        _save_png_pil)
+
+def _gpu_available():
+    """ True when torchvision is installed and sees a CUDA device; imported lazily, torch is heavy """
+    try:
+        import torch
+        import torchvision
+    except ImportError:
+        return False
+    # Batched CUDA decode_jpeg/encode_jpeg arrived in torchvision 0.19
+    version = tuple(int(part) for part in torchvision.__version__.split("+")[0].split(".")[:2])
+    return version >= (0, 19) and torch.cuda.is_available()
+
+def _read_gpu_batches(img_paths, batches, stop):
+    """ Reader thread: prefetch the raw bytes of upcoming GPU batches while the current one is on the device.
+        Always ends with a None sentinel; a batch that could not be read is passed on as (batch, None) """
+    try:
+        for start in range(0, len(img_paths), GPU_BATCH_SIZE):
+            if stop.is_set():
+                break
+            batch = img_paths[start:start + GPU_BATCH_SIZE]
+            try:
+                data = [img_path.read_bytes() for img_path in batch]
+            except Exception:
+                data = None
+            batches.put((batch, data))
+    finally:
+        batches.put(None)
+
+def _resize_batch_with_gpu(data, target_size, jpeg_quality):
+    """ Decode, resize and encode a batch of JPEG files on an NVIDIA GPU (nvJPEG through torchvision).
+        Raises ValueError if any file in the batch cannot be decoded, anything else is a device failure """
+    import torch
+    import torch.nn.functional as F
+    from torchvision.io import ImageReadMode, decode_jpeg, encode_jpeg
+
+    encoded_input = [torch.frombuffer(bytearray(raw), dtype=torch.uint8) for raw in data]
+    try:
+        images = decode_jpeg(encoded_input, mode=ImageReadMode.RGB, device="cuda")
+    except torch.cuda.OutOfMemoryError:
+        raise
+    except RuntimeError as e:
+        # nvJPEG rejects the whole batch when one file is corrupt or not really a JPEG
+        raise ValueError(str(e)) from e
+
+    resized = []
+    for img in images:
+        height, width = img.shape[-2:]
+        current_max = max(width, height)
+        if current_max > target_size:
+            # torch has no LANCZOS; antialiased bicubic is the closest filter
+            ratio = target_size / current_max
+            new_size = (max(1, int(height * ratio)), max(1, int(width * ratio)))
+            img = F.interpolate(img.unsqueeze(0).float(), size=new_size, mode="bicubic", antialias=True)
+            img = img.squeeze(0).round_().clamp_(0, 255).to(torch.uint8)
+        resized.append(img)
+
+    return [buf.cpu().numpy().tobytes() for buf in encode_jpeg(resized, quality=jpeg_quality)]
+
+def _write_gpu_output(img_path, data, output_dir, overwrite, jpeg_mozjpeg):
+    """ Writer thread: save one GPU-encoded JPEG so disk writes overlap the next batch """
+    try:
+        save_path = img_path if overwrite else output_dir / img_path.name
+        save_path.write_bytes(data)
+        if jpeg_mozjpeg:
+            _mozjpeg_recompress(save_path, True)
+        return img_path.name, True, f"Processed: {img_path.name}"
+    except Exception as e:
+        return img_path.name, False, f"Error with {img_path.name}: {str(e)}"
+
 class Worker(QThread):
     """ A worker thread to handle image processing without freezing the GUI """
-    progress = pyqtSignal(int)
     log = pyqtSignal(str)
     finished = pyqtSignal()
 
-    def __init__(self, input_dir, output_dir, target_size, jpeg_quality, overwrite):
+    def __init__(self, input_dir, output_dir, target_size, jpeg_quality, overwrite, strip_metadata=True,
+                 jpeg_optimize=False, jpeg_progressive=False, jpeg_mozjpeg=False, use_gpu=False):
         super().__init__()
         self.input_dir = input_dir
         self.output_dir = output_dir
         self.target_size = target_size
         self.jpeg_quality = jpeg_quality
         self.overwrite = overwrite
+        self.strip_metadata = strip_metadata
+        self.jpeg_optimize = jpeg_optimize
+        self.jpeg_progressive = jpeg_progressive
+        self.jpeg_mozjpeg = jpeg_mozjpeg
+        self.use_gpu = use_gpu
+        # Progress counters, written only by this thread and polled by the GUI.
+        # Plain int stores are atomic under the GIL (PyQt5 does not wrap QAtomicInt)
+        self.total = 0
+        self.done = 0
+        # Per-file log lines waiting to be emitted; filled once reporting starts
+        self.log_buffer = []
+        self.flush_timer = QElapsedTimer()
 
     def run(self):
         try:
@@ -40,9 +402,12 @@ class Worker(QThread):
             if not self.overwrite and output_path and not output_path.exists():
                 output_path.mkdir(parents=True, exist_ok=True)
 
-            image_files = list(input_path.glob("*.jpg")) + \
-                          list(input_path.glob("*.jpeg")) + \
-                          list(input_path.glob("*.png"))
+            # One directory pass; DirEntry caches the file type, so no extra stat() per entry
+            with os.scandir(input_path) as entries:
+                image_files = [
+                    Path(entry.path) for entry in entries
+                    if entry.is_file() and os.path.splitext(entry.name)[1].lower() in IMAGE_FORMATS
+                ]
 
             total = len(image_files)
             if total == 0:
@@ -50,66 +415,143 @@ class Worker(QThread):
                 self.finished.emit()
                 return
 
-            for i, img_path in enumerate(image_files):
-                try:
-                    with Image.open(img_path) as img:
-                        # Strip metadata
-                        if hasattr(img, 'info'):
-                            img.info.clear()
-
-                        width, height = img.size
-                        current_max = max(width, height)
-
-                        if current_max <= self.target_size:
-                            new_img = img.copy()
-                        else:
-                            ratio = self.target_size / current_max
-                            new_size = (int(width * ratio), int(height * ratio))
-                            new_img = img.resize(new_size, Image.LANCZOS)
-
-                        # Strip metadata from the new image as well
-                        if hasattr(new_img, 'info'):
-                            new_img.info.clear()
-
-                        # Define save path
-                        save_path = img_path if self.overwrite else output_path / img_path.name
-                        
-                        ext = save_path.suffix.lower()
-                        if ext in ('.jpg', '.jpeg'):
-                            # Convert to RGB if necessary (for formats like RGBA or P)
-                            if new_img.mode in ("RGBA", "P"):
-                                background = Image.new("RGB", new_img.size, (255, 255, 255))
-                                if new_img.mode == "RGBA":
-                                    background.paste(new_img, mask=new_img.split()[-1])
-                                else:
-                                    background.paste(new_img)
-                                new_img = background
-                            
-                            # Save with user-defined quality
-                            new_img.save(save_path, "JPEG", quality=self.jpeg_quality, optimize=True)
-
-                        else:  # PNG
-                            new_img.save(save_path, "PNG", optimize=True)
-
-                        self.log.emit(f"Processed: {img_path.name}")
-                except Exception as e:
-                    self.log.emit(f"Error with {img_path.name}: {str(e)}")
-
-                self.progress.emit(int((i + 1) / total * 100))
+            if not features.check_feature("libjpeg_turbo"):
+                self.log.emit("Warning: Pillow is not built with libjpeg-turbo, JPEG processing will be slower.")
+
+            # Frozen single-exe builds pay a full unpack per spawned process,
+            # so fall back to threads there (Pillow releases the GIL in its codecs)
+            if getattr(sys, "frozen", False):
+                executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+            else:
+                # max_workers=None means os.cpu_count(), capped at the 61 processes Windows allows
+                executor = ProcessPoolExecutor(max_workers=None,
+                                               mp_context=multiprocessing.get_context("spawn"))
+
+            # Group by format once, so each group goes to its specialized pool entry point
+            jpeg_files = [p for p in image_files if IMAGE_FORMATS[p.suffix.lower()] == "JPEG"]
+            png_files = [p for p in image_files if IMAGE_FORMATS[p.suffix.lower()] == "PNG"]
+
+            # The GPU encoder writes baseline JPEG without metadata, so other settings stay on the CPU
+            gpu_files = []
+            if self.use_gpu:
+                if (self.strip_metadata and not (self.jpeg_optimize or self.jpeg_progressive)
+                        and _gpu_available()):
+                    gpu_files, jpeg_files = jpeg_files, []
+                else:
+                    self.log.emit("GPU mode needs a CUDA device, metadata stripping and baseline JPEG; "
+                                  "using the CPU instead.")
+
+            self.start_reporting(total)
+            with executor, ThreadPoolExecutor(max_workers=1) as writer:
+                futures = [self.submit_jpeg(executor, img_path, output_path) for img_path in jpeg_files]
+                futures += [self.submit_png(executor, img_path, output_path) for img_path in png_files]
+
+                # GPU batches run on this thread while the pool works through the rest.
+                # Reads are prefetched and writes deferred, so the device never waits on the disk
+                if gpu_files:
+                    batches = queue.Queue(maxsize=GPU_PREFETCH_BATCHES)
+                    stop_reading = threading.Event()
+                    threading.Thread(target=_read_gpu_batches, args=(gpu_files, batches, stop_reading),
+                                     daemon=True).start()
+                    try:
+                        start = 0
+                        for batch, data in iter(batches.get, None):
+                            try:
+                                if data is None:
+                                    raise OSError("read failed")
+                                encoded = _resize_batch_with_gpu(data, self.target_size, self.jpeg_quality)
+                            except (OSError, ValueError):
+                                # A corrupt or mislabelled file fails the whole batched call
+                                futures += [self.submit_jpeg(executor, img_path, output_path)
+                                            for img_path in batch]
+                                start += len(batch)
+                                continue
+                            except Exception as e:
+                                # The device itself failed (out of memory, driver error), so stop using it
+                                self.flush_log()
+                                self.log.emit(f"GPU error: {str(e)}; "
+                                              "processing the remaining JPEG files on the CPU.")
+                                futures += [self.submit_jpeg(executor, img_path, output_path)
+                                            for img_path in gpu_files[start:]]
+                                break
+                            start += len(batch)
+                            futures += [
+                                writer.submit(_write_gpu_output, img_path, buf, output_path,
+                                              self.overwrite, self.jpeg_mozjpeg)
+                                for img_path, buf in zip(batch, encoded)
+                            ]
+                            # Report whatever the pool and writer finished meanwhile, so progress
+                            # keeps moving during the GPU phase
+                            futures = self.report_done(futures)
+                    finally:
+                        # If the loop stopped early, the reader may be blocked on a full queue.
+                        # Once stopped it puts at most one more batch and the sentinel, which fit
+                        # after the queue is emptied, so it always exits
+                        stop_reading.set()
+                        while True:
+                            try:
+                                batches.get_nowait()
+                            except queue.Empty:
+                                break
+
+                for future in as_completed(futures):
+                    name, ok, msg = future.result()
+                    self.report(msg)
+
+            self.flush_log()
 
             self.log.emit("Conversion completed.")
         except Exception as e:
+            # Emit the buffered per-file lines first, they usually explain the failure
+            self.flush_log()
             self.log.emit(f"Critical error: {str(e)}")
         finally:
             self.finished.emit()
 
+    def report_done(self, futures):
+        """ Report the futures that have already completed and return the ones still pending """
+        done, pending = wait(futures, timeout=0)
+        for future in done:
+            name, ok, msg = future.result()
+            self.report(msg)
+        return list(pending)
+
+    def submit_jpeg(self, executor, img_path, output_path):
+        return executor.submit(_process_jpeg, img_path, output_path, self.target_size, self.overwrite,
+                               self.strip_metadata, self.jpeg_quality, self.jpeg_optimize,
+                               self.jpeg_progressive, self.jpeg_mozjpeg)
+
+    def submit_png(self, executor, img_path, output_path):
+        return executor.submit(_process_png, img_path, output_path, self.target_size, self.overwrite,
+                               self.strip_metadata)
+
+    # Coalesce cross-thread log signals into one update per batch, however many images there are
+    def start_reporting(self, total):
+        self.done = 0
+        self.total = total
+        self.log_buffer = []
+        self.flush_timer = QElapsedTimer()
+        self.flush_timer.start()
+
+    def report(self, msg):
+        self.done += 1
+        self.log_buffer.append(msg)
+        if len(self.log_buffer) >= LOG_FLUSH_COUNT or self.flush_timer.hasExpired(LOG_FLUSH_MS):
+            self.flush_log()
+
+    def flush_log(self):
+        if self.log_buffer:
+            self.log.emit("\n".join(self.log_buffer))
+            self.log_buffer.clear()
+        self.flush_timer.restart()
+
 
 class MainWindow(QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowIcon(QIcon(resource_path("icon.ico")))
         self.setWindowTitle("Bulk Image Resizer")
-        self.setFixedSize(620, 750) # Adjusted height after removing footer
+        self.setFixedSize(620, 824) # Two extra checkbox rows, log window keeps its height
         self.init_ui()
 
     def init_ui(self):
@@ -160,10 +602,37 @@ class MainWindow(QWidget):
         self.quality_line.setText("80") # Default value
         layout.addWidget(self.quality_line)
         
-        # Overwrite Checkbox
+        # Checkboxes, two per row to keep room for the log window
+        options_layout = QGridLayout()
+
+        # Overwrite and Strip Metadata
         self.overwrite_cb = QCheckBox("Overwrite original images")
         self.overwrite_cb.stateChanged.connect(self.toggle_output)
-        layout.addWidget(self.overwrite_cb)
+        self.strip_cb = QCheckBox("Strip metadata (EXIF, ICC)")
+        self.strip_cb.setChecked(True)
+        options_layout.addWidget(self.overwrite_cb, 0, 0)
+        options_layout.addWidget(self.strip_cb, 0, 1)
+
+        # JPEG Encoder Options (off by default: each one costs extra encode time)
+        self.optimize_cb = QCheckBox("Optimize JPEG Huffman tables")
+        self.optimize_cb.setToolTip("Slightly smaller files, roughly twice the encoding time")
+        self.progressive_cb = QCheckBox("Save progressive JPEG")
+        options_layout.addWidget(self.optimize_cb, 1, 0)
+        options_layout.addWidget(self.progressive_cb, 1, 1)
+
+        # mozjpeg and GPU
+        self.mozjpeg_cb = QCheckBox("Recompress with mozjpeg")
+        self.mozjpeg_cb.setToolTip("Smallest files, much slower")
+        if mozjpeg_lossless_optimization is None:
+            self.mozjpeg_cb.setEnabled(False)
+            self.mozjpeg_cb.setToolTip("Install mozjpeg-lossless-optimization to enable this option")
+        self.gpu_cb = QCheckBox("Use NVIDIA GPU for JPEG")
+        if importlib.util.find_spec("torchvision") is None:
+            self.gpu_cb.setEnabled(False)
+            self.gpu_cb.setToolTip("Install PyTorch and torchvision with CUDA support to enable this option")
+        options_layout.addWidget(self.mozjpeg_cb, 2, 0)
+        options_layout.addWidget(self.gpu_cb, 2, 1)
+        layout.addLayout(options_layout)
 
         # Start Button
         self.start_btn = QPushButton("START")
@@ -175,6 +644,9 @@ class MainWindow(QWidget):
         self.progress_bar = QProgressBar()
         self.progress_bar.setValue(0)
         layout.addWidget(self.progress_bar)
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(PROGRESS_POLL_MS)
+        self.progress_timer.timeout.connect(self.update_progress)
 
         # Log Window
         self.log_text = QTextEdit()
@@ -204,6 +676,11 @@ class MainWindow(QWidget):
         size_text = self.size_line.text().strip()
         quality_text = self.quality_line.text().strip()
         overwrite = self.overwrite_cb.isChecked()
+        strip_metadata = self.strip_cb.isChecked()
+        jpeg_optimize = self.optimize_cb.isChecked()
+        jpeg_progressive = self.progressive_cb.isChecked()
+        jpeg_mozjpeg = self.mozjpeg_cb.isChecked()
+        use_gpu = self.gpu_cb.isChecked()
 
         if not input_dir or not os.path.isdir(input_dir):
             self.log_text.append("Error: Invalid source folder.")
@@ -228,13 +705,20 @@ class MainWindow(QWidget):
         self.progress_bar.setValue(0)
         self.log_text.clear()
 
-        self.worker = Worker(input_dir, output_dir, target_size, jpeg_quality, overwrite)
-        self.worker.progress.connect(self.progress_bar.setValue)
+        self.worker = Worker(input_dir, output_dir, target_size, jpeg_quality, overwrite, strip_metadata,
+                             jpeg_optimize, jpeg_progressive, jpeg_mozjpeg, use_gpu)
         self.worker.log.connect(self.log_text.append)
         self.worker.finished.connect(self.on_finished)
         self.worker.start()
+        self.progress_timer.start()
+
+    def update_progress(self):
+        if self.worker.total:
+            self.progress_bar.setValue(int(self.worker.done / self.worker.total * 100))
 
     def on_finished(self):
+        self.progress_timer.stop()
+        self.update_progress()
         self.start_btn.setEnabled(True)
 
 